@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import asyncio
+import collections
 import threading
 import time
 import random
@@ -29,6 +31,12 @@ parser.add_argument('--max-delay', type=float, default=0.5,
                     help='Delay máximo (s)')
 parser.add_argument('--gui', action='store_true',
                     help='Ativa interface gráfica')
+parser.add_argument('--asyncio', action='store_true',
+                    help='Roda as transações como corrotinas em um event loop '
+                         'asyncio em vez de threads do SO')
+parser.add_argument('--pool', type=int, default=0, metavar='SIZE',
+                    help='Executa as transações em um pool de SIZE threads '
+                         'reutilizáveis (0 = uma thread por transação)')
 args = parser.parse_args()
 random.seed(args.seed)
 
@@ -36,143 +44,426 @@ random.seed(args.seed)
 # Logs e métricas globais
 # -----------------------------------
 log_queue     = queue.Queue()
-event_queue   = []    # para Gantt: (timestamp, txn_name, msg)
+# para Gantt: txn_name -> deque de (timestamp, kind); maxlen limita a
+# varredura do refresh aos eventos recentes
+events_by_txn = collections.defaultdict(lambda: collections.deque(maxlen=500))
+sim_start_ts  = None   # timestamp do primeiro evento
 deadlock_count = 0
 abort_count    = 0
 wait_times     = []
 
-def log_event(msg, color=None):
-    """Loga no terminal e envia para a UI."""
+print_queue = queue.Queue()
+ui_dirty    = threading.Event()   # algo novo para a UI redesenhar
+
+def _print_worker():
+    """Formata e imprime as entradas de log fora dos caminhos de lock."""
+    while True:
+        ts, msg = print_queue.get()
+        ts_str = time.strftime("%H:%M:%S", time.localtime(ts))
+        print(f"[{ts_str}] {msg}")
+        print_queue.task_done()
+
+threading.Thread(target=_print_worker, daemon=True).start()
+
+def log_event(txn_name, kind, detail, color=None):
+    """Registra o evento estruturado (sem parse de string nos consumidores).
+
+    txn_name é None para eventos globais; kind é o estado usado no Gantt
+    e detail o texto completo exibido (sem o nome da transação).
+    """
+    global sim_start_ts
     ts = time.time()
-    ts_str = time.strftime("%H:%M:%S", time.localtime(ts))
-    entry = f"[{ts_str}] {msg}"
-    print(entry)
-    log_queue.put((entry, color))
-    # extrai nome da transação
-    parts = msg.split()
-    txn_name = parts[0] if parts and parts[0].startswith("T") else None
-    event_queue.append((ts, txn_name, msg))
+    if sim_start_ts is None:
+        sim_start_ts = ts
+    msg = f"{txn_name} {detail}" if txn_name else detail
+    print_queue.put((ts, msg))
+    log_queue.put((ts, msg, color))
+    if txn_name:
+        events_by_txn[txn_name].append((ts, kind))
+    ui_dirty.set()
 
 # -----------------------------------
-# Flags de requisitos
+# Flags de requisitos (bitmask)
 # -----------------------------------
-flags = {
-    'sim': False, 'control': False, 'deadlock': False,
-    'threads': False, 'resolve': False,
-    'random': False, 'logs': False
-}
-def mark(flag):
-    if not flags[flag]:
-        flags[flag] = True
-        log_queue.put(('_FLAG_', flag))
+F_SIM      = 1
+F_CONTROL  = 2
+F_DEADLOCK = 4
+F_THREADS  = 8
+F_RESOLVE  = 16
+F_RANDOM   = 32
+F_LOGS     = 64
+ALL_FLAGS  = 127
+FLAGS      = 0
+
+def _mark_noop(bit):
+    pass
+
+def mark(bit):
+    global FLAGS, mark
+    if FLAGS & bit:
+        return
+    FLAGS |= bit
+    log_queue.put(('_FLAG_', bit))
+    ui_dirty.set()
+    if FLAGS == ALL_FLAGS:
+        # saturou: troca o global por um no-op e elimina o custo residual
+        mark = _mark_noop
 
 # -----------------------------------
 # Recursos e LockManager
 # -----------------------------------
+def find_cycle(graph):
+    """Tarjan iterativo sobre a adjacência txn -> [donos esperados].
+
+    Um SCC com >=2 nós é exatamente o ciclo de deadlock; devolve o
+    primeiro encontrado, ou None.
+    """
+    index, lowlink, onstack = {}, {}, {}
+    scc_stack = collections.deque()
+    counter = 0
+    for root in graph:
+        if root in index:
+            continue
+        work = collections.deque([(root, iter(graph[root]))])
+        index[root] = lowlink[root] = counter; counter += 1
+        scc_stack.append(root); onstack[root] = True
+        while work:
+            v, succs = work[-1]
+            advanced = False
+            for nb in succs:
+                if nb not in index:
+                    index[nb] = lowlink[nb] = counter; counter += 1
+                    scc_stack.append(nb); onstack[nb] = True
+                    work.append((nb, iter(graph[nb])))
+                    advanced = True
+                    break
+                elif onstack.get(nb) and index[nb] < lowlink[v]:
+                    lowlink[v] = index[nb]
+            if advanced:
+                continue
+            work.pop()
+            if work and lowlink[v] < lowlink[work[-1][0]]:
+                lowlink[work[-1][0]] = lowlink[v]
+            if lowlink[v] == index[v]:
+                scc = []
+                while True:
+                    w = scc_stack.pop(); onstack[w] = False
+                    scc.append(w)
+                    if w is v:
+                        break
+                if len(scc) >= 2:
+                    return scc
+    return None
+
 class Resource:
     def __init__(self, item_id):
         self.item_id   = item_id
         self.locked_by = None
-        self.queue     = []
-        self.cond      = threading.Condition()
+        self.queue     = collections.deque()   # txns esperando, FIFO
+        self.events    = {}                    # txn -> threading.Event
+        self.lock      = threading.Lock()
 
 class LockManager:
     def __init__(self, resources):
         self.resources = {rid: Resource(rid) for rid in resources}
+        self.snap_lock = threading.Lock()
+        self._detect_lock = threading.Lock()   # no máx. uma varredura por vez
+        self.waiters   = {}                 # txn -> início da espera (t0)
+        self._wake     = threading.Event()  # acordado quando alguém entra em espera
+        self._detector = threading.Thread(target=self._detector_loop, daemon=True)
+        self._detector.start()
+
+    def _detection_timeout(self):
+        """Timeout adaptativo: 2x o delay mínimo ou 1.5x a espera média recente.
+
+        Limitado a 2x o delay máximo: esperas que atravessam um deadlock
+        entram em wait_times e, sem o teto, realimentariam o timeout.
+        """
+        timeout = args.min_delay * 2
+        recent = wait_times[-32:]
+        if recent:
+            timeout = max(timeout, 1.5 * sum(recent) / len(recent))
+        return min(timeout, args.max_delay * 2)
+
+    def _detector_loop(self):
+        """Detecção preguiçosa: só roda quando alguma espera excede o timeout."""
+        while True:
+            self._wake.wait()
+            timeout = self._detection_timeout()
+            time.sleep(timeout)
+            now = time.time()
+            with self.snap_lock:
+                suspects = {t for t, t0 in self.waiters.items() if now - t0 >= timeout}
+                if not self.waiters:
+                    self._wake.clear()
+            if suspects:
+                self._detect_and_resolve(suspects)
 
     def acquire(self, txn, rid):
-        mark('control')
+        _time = time.time
+        _log  = log_event
+        mark(F_CONTROL)
         res = self.resources[rid]
-        t0  = time.time()
-        with res.cond:
+        t0  = _time()
+        # seção crítica curta: só muda estado; logs saem depois do with
+        with res.lock:
             if res.locked_by is None:
                 res.locked_by = txn
-                txn.held.append(res)
-                log_event(f"{txn.name} obteve lock({rid})", "green"); mark('logs')
+                txn.held.add(res)
+                granted = True
+            elif res.locked_by is txn:
                 return
-            if res.locked_by == txn:
+            else:
+                # um Event de disparo único por waiter: o release entrega o
+                # lock direto à cabeça da fila, sem broadcast nem wait-loop
+                ev = threading.Event()
+                res.queue.append(txn)
+                res.events[txn] = ev
+                txn.waiting_on = res
+                with self.snap_lock:
+                    self.waiters[txn] = t0
+                self._wake.set()
+                granted = False
+        if granted:
+            _log(txn.name, 'obteve', f"obteve lock({rid})", "green"); mark(F_LOGS)
+            return
+        _log(txn.name, 'esperando', f"está esperando por lock({rid})", "orange"); mark(F_LOGS)
+        ev.wait()
+        txn.waiting_on = None
+        with self.snap_lock:
+            self.waiters.pop(txn, None)
+        if txn.aborted:
+            txn.aborted = False
+            raise AbortException()
+        wait_times.append(_time() - t0)
+        _log(txn.name, 'obteve', f"obteve lock({rid}) após espera", "green"); mark(F_LOGS)
+
+    def release(self, txn, rid):
+        res = self.resources[rid]
+        with res.lock:
+            if res.locked_by is not txn:
                 return
-            res.queue.append(txn)
-            log_event(f"{txn.name} está esperando por lock({rid})", "orange"); mark('logs')
-            self._detect_and_resolve()
-            while True:
-                if getattr(txn, 'aborted', False):
-                    txn.aborted = False
-                    raise AbortException()
-                if res.locked_by is None and res.queue[0] == txn:
-                    res.queue.pop(0)
-                    res.locked_by = txn
-                    txn.held.append(res)
-                    t1 = time.time()
-                    wait_times.append(t1 - t0)
-                    log_event(f"{txn.name} obteve lock({rid}) após espera", "green"); mark('logs')
-                    return
-                res.cond.wait()
+            txn.held.remove(res)
+            ev = self._grant_next(res)
+        # set já fora da seção de mutação: o acordado não bloqueia
+        # tentando adquirir um lock que o notificador ainda segura
+        if ev is not None:
+            ev.set()
+        log_event(txn.name, 'liberou', f"liberou lock({rid})", "blue"); mark(F_LOGS)
+
+    def _grant_next(self, res):
+        """Com res.lock: entrega o lock à próxima txn viva da fila.
+
+        Devolve o Event do novo dono (para setar fora do lock), ou None
+        se a fila esvaziou e o recurso ficou livre.
+        """
+        while res.queue:
+            nxt = res.queue.popleft()
+            ev  = res.events.pop(nxt)
+            if nxt.aborted:
+                ev.set()   # acorda só para observar o flag aborted
+                continue
+            res.locked_by = nxt
+            nxt.held.add(res)
+            return ev
+        res.locked_by = None
+        return None
+
+    def _snapshot(self):
+        """Cópia consistente de dono/fila de todos os recursos.
+
+        Segura todos os locks de recurso ao mesmo tempo, só pelo tempo
+        da cópia; o Tarjan roda depois sobre a cópia, sem bloquear
+        acquire/release nem arriscar uma visão rasgada do grafo.
+        """
+        resources = list(self.resources.values())
+        for r in resources:
+            r.lock.acquire()
+        try:
+            return {r.item_id: (r.locked_by, tuple(r.queue)) for r in resources}
+        finally:
+            for r in resources:
+                r.lock.release()
+
+    def _detect_and_resolve(self, suspects=None):
+        global deadlock_count
+        mark(F_DEADLOCK)
+        # coalescência: se já há uma varredura em andamento, ela cobre
+        # este pedido -- não vale a pena enfileirar outra igual
+        if not self._detect_lock.acquire(blocking=False):
+            return
+        try:
+            # uma única passada: nós (donos) + arestas (quem espera -> dono)
+            graph = collections.defaultdict(list)
+            for owner, waiting in self._snapshot().values():
+                if owner is not None:
+                    graph[owner]
+                for w in waiting:
+                    if owner is not None and owner is not w and (suspects is None or w in suspects):
+                        graph[w].append(owner)
+            cycle = find_cycle(graph)
+            if cycle:
+                to_abort = max(cycle, key=lambda tr: tr.ts)
+                log_event(None, 'deadlock', f"Deadlock em {[tr.name for tr in cycle]}, abortando {to_abort.name}", "red")
+                mark(F_RESOLVE)
+                deadlock_count += 1
+                self._abort(to_abort)
+        finally:
+            self._detect_lock.release()
+
+    def _abort(self, txn):
+        global abort_count
+        abort_count += 1
+        txn.aborted = True
+        for r in list(txn.held):
+            with r.lock:
+                if r.locked_by is not txn:
+                    continue
+                txn.held.discard(r)
+                ev = self._grant_next(r)
+            if ev is not None:
+                ev.set()
+        # acorda apenas a txn abortada, no único recurso onde ela espera
+        res = txn.waiting_on
+        if res is not None:
+            ev = None
+            with res.lock:
+                if txn in res.queue:
+                    res.queue.remove(txn)
+                    ev = res.events.pop(txn)
+            if ev is not None:
+                ev.set()
+
+class AbortException(Exception):
+    pass
+
+# -----------------------------------
+# Pool de workers de transação
+# -----------------------------------
+class TxnPool:
+    """Threads de longa duração reutilizadas entre transações.
+
+    Em vez de criar e destruir uma thread do SO (stack de ~8KB) por
+    transação, `size` workers bloqueiam em uma fila de jobs e executam
+    os corpos das transações submetidas; o mesmo worker atende várias
+    transações em sequência.
+    """
+    def __init__(self, size):
+        self._jobs = queue.Queue()
+        for _ in range(size):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def _worker(self):
+        while True:
+            txn = self._jobs.get()
+            try:
+                txn.run()
+            finally:
+                self._jobs.task_done()
+
+    def submit(self, txn):
+        self._jobs.put(txn)
+
+    def join(self):
+        """Bloqueia até todas as transações submetidas terminarem."""
+        self._jobs.join()
+
+# -----------------------------------
+# Modo asyncio: scheduler cooperativo
+# -----------------------------------
+class AsyncResource:
+    def __init__(self, item_id):
+        self.item_id   = item_id
+        self.locked_by = None
+        self.queue     = collections.deque()   # txns esperando, FIFO
+        self.events    = {}                    # txn -> asyncio.Event
+
+class AsyncLockManager:
+    """LockManager para o modo --asyncio.
+
+    Tudo roda cooperativamente em um único event loop: não há mutex nem
+    seção crítica a encurtar, então a detecção volta a rodar inline no
+    momento em que uma transação bloqueia, e o handoff do lock é um
+    asyncio.Event único por waiter.
+    """
+    def __init__(self, resources):
+        self.resources = {rid: AsyncResource(rid) for rid in resources}
+
+    async def acquire(self, txn, rid):
+        mark(F_CONTROL)
+        res = self.resources[rid]
+        if res.locked_by is None:
+            res.locked_by = txn
+            txn.held.add(res)
+            log_event(txn.name, 'obteve', f"obteve lock({rid})", "green"); mark(F_LOGS)
+            return
+        if res.locked_by is txn:
+            return
+        t0 = time.time()
+        ev = asyncio.Event()
+        res.queue.append(txn)
+        res.events[txn] = ev
+        log_event(txn.name, 'esperando', f"está esperando por lock({rid})", "orange"); mark(F_LOGS)
+        self._detect_and_resolve()
+        await ev.wait()
+        if txn.aborted:
+            txn.aborted = False
+            raise AbortException()
+        wait_times.append(time.time() - t0)
+        log_event(txn.name, 'obteve', f"obteve lock({rid}) após espera", "green"); mark(F_LOGS)
 
     def release(self, txn, rid):
         res = self.resources[rid]
-        with res.cond:
-            if res.locked_by == txn:
-                res.locked_by = None
-                txn.held.remove(res)
-                log_event(f"{txn.name} liberou lock({rid})", "blue"); mark('logs')
-                res.cond.notify_all()
+        if res.locked_by is not txn:
+            return
+        txn.held.discard(res)
+        self._grant_next(res)
+        log_event(txn.name, 'liberou', f"liberou lock({rid})", "blue"); mark(F_LOGS)
+
+    def _grant_next(self, res):
+        """Entrega o lock à próxima txn viva da fila (ou deixa livre)."""
+        while res.queue:
+            nxt = res.queue.popleft()
+            ev  = res.events.pop(nxt)
+            if nxt.aborted:
+                ev.set()
+                continue
+            res.locked_by = nxt
+            nxt.held.add(res)
+            ev.set()
+            return
+        res.locked_by = None
 
     def _detect_and_resolve(self):
         global deadlock_count
-        mark('deadlock')
-        graph = {}
-        all_t = set()
-        for r in self.resources.values():
-            if r.locked_by: all_t.add(r.locked_by)
-            all_t.update(r.queue)
-        for t in all_t:
-            graph[t] = []
+        mark(F_DEADLOCK)
+        graph = collections.defaultdict(list)
         for r in self.resources.values():
             owner = r.locked_by
+            if owner is not None:
+                graph[owner]
             for w in r.queue:
-                if owner:
+                if owner is not None and owner is not w:
                     graph[w].append(owner)
-        visited, stack = set(), set()
-        def dfs(v):
-            visited.add(v); stack.add(v)
-            for nb in graph[v]:
-                if nb not in visited:
-                    cyc = dfs(nb)
-                    if cyc: return cyc
-                elif nb in stack:
-                    return list(stack)
-            stack.remove(v)
-            return None
-
-        for t in graph:
-            if t not in visited:
-                cycle = dfs(t)
-                if cycle:
-                    to_abort = max(cycle, key=lambda tr: tr.ts)
-                    log_event(f"Deadlock em {[tr.name for tr in cycle]}, abortando {to_abort.name}", "red")
-                    mark('resolve')
-                    deadlock_count += 1
-                    self._abort(to_abort)
-                    return
+        cycle = find_cycle(graph)
+        if cycle:
+            to_abort = max(cycle, key=lambda tr: tr.ts)
+            log_event(None, 'deadlock', f"Deadlock em {[tr.name for tr in cycle]}, abortando {to_abort.name}", "red")
+            mark(F_RESOLVE)
+            deadlock_count += 1
+            self._abort(to_abort)
 
     def _abort(self, txn):
         global abort_count
         abort_count += 1
         txn.aborted = True
         for r in list(txn.held):
-            with r.cond:
-                r.locked_by = None
-                txn.held.remove(r)
-                r.cond.notify_all()
+            txn.held.discard(r)
+            self._grant_next(r)
         for r in self.resources.values():
             if txn in r.queue:
                 r.queue.remove(txn)
-                with r.cond:
-                    r.cond.notify_all()
-
-class AbortException(Exception):
-    pass
+                r.events.pop(txn).set()
 
 # -----------------------------------
 # Thread de Transação
@@ -186,43 +477,92 @@ class Transaction(threading.Thread):
         super().__init__(name=f"T{tid}")
         self.ts        = ts
         self.lm        = lm
-        self.held      = []
-        self.committed = False
-        self.aborted   = False
+        self.held      = set()
+        self.committed  = False
+        self.aborted    = False
+        self.waiting_on = None
         self.color     = self.COLORS[(tid-1) % len(self.COLORS)]
+        # RNG privado por transação: sem disputa pelo estado global do
+        # módulo random entre threads, e determinístico por (seed, tid)
+        self._rng      = random.Random(args.seed + tid)
+        self._uniform  = self._rng.uniform
 
     def run(self):
-        mark('sim'); mark('threads')
+        # LOAD_GLOBAL/LOAD_ATTR -> LOAD_FAST no laço quente
+        _sleep = time.sleep
+        _uni   = self._uniform
+        _lo    = args.min_delay
+        _hi    = args.max_delay
+        _mark  = mark
+        _log   = log_event
+        inverted = args.force_deadlock and (self.ts % 2 == 0)
+        _mark(F_SIM); _mark(F_THREADS)
         while not self.committed:
             try:
-                log_event(f"{self.name} entrou em execução", self.color); mark('logs')
-                d = random.uniform(args.min_delay, args.max_delay)
-                time.sleep(d); mark('random')
+                _log(self.name, 'entrou', "entrou em execução", self.color); _mark(F_LOGS)
+                _sleep(_uni(_lo, _hi)); _mark(F_RANDOM)
 
-                if args.force_deadlock and (self.ts % 2 == 0):
+                if inverted:
                     self.lm.acquire(self, 'Y')
-                    log_event(f"{self.name} leu Y", self.color); mark('logs')
-                    time.sleep(random.uniform(args.min_delay, args.max_delay)); mark('random')
+                    _log(self.name, 'leu', "leu Y", self.color); _mark(F_LOGS)
+                    _sleep(_uni(_lo, _hi)); _mark(F_RANDOM)
                     self.lm.acquire(self, 'X')
-                    log_event(f"{self.name} leu X", self.color); mark('logs')
+                    _log(self.name, 'leu', "leu X", self.color); _mark(F_LOGS)
                 else:
                     self.lm.acquire(self, 'X')
-                    log_event(f"{self.name} leu X", self.color); mark('logs')
-                    time.sleep(random.uniform(args.min_delay, args.max_delay)); mark('random')
+                    _log(self.name, 'leu', "leu X", self.color); _mark(F_LOGS)
+                    _sleep(_uni(_lo, _hi)); _mark(F_RANDOM)
                     self.lm.acquire(self, 'Y')
-                    log_event(f"{self.name} leu Y", self.color); mark('logs')
+                    _log(self.name, 'leu', "leu Y", self.color); _mark(F_LOGS)
 
-                time.sleep(random.uniform(args.min_delay, args.max_delay)); mark('random')
-                log_event(f"{self.name} escreveu X e Y", self.color); mark('logs')
+                _sleep(_uni(_lo, _hi)); _mark(F_RANDOM)
+                _log(self.name, 'escreveu', "escreveu X e Y", self.color); _mark(F_LOGS)
                 self.lm.release(self, 'X')
                 self.lm.release(self, 'Y')
-                log_event(f"{self.name} finalizou com sucesso", self.color); mark('logs')
+                _log(self.name, 'finalizou', "finalizou com sucesso", self.color); _mark(F_LOGS)
                 self.committed = True
 
             except AbortException:
-                log_event(f"{self.name} abortada, reiniciando", "purple"); mark('logs')
+                _log(self.name, 'abortada', "abortada, reiniciando", "purple"); _mark(F_LOGS)
                 self.held.clear()
-                time.sleep(random.uniform(args.min_delay, args.max_delay)); mark('random')
+                _sleep(_uni(_lo, _hi)); _mark(F_RANDOM)
+
+    async def run_async(self):
+        """Corpo da transação no modo --asyncio (espelha run)."""
+        _uni = self._uniform
+        _lo  = args.min_delay
+        _hi  = args.max_delay
+        inverted = args.force_deadlock and (self.ts % 2 == 0)
+        mark(F_SIM); mark(F_THREADS)
+        while not self.committed:
+            try:
+                log_event(self.name, 'entrou', "entrou em execução", self.color); mark(F_LOGS)
+                await asyncio.sleep(_uni(_lo, _hi)); mark(F_RANDOM)
+
+                if inverted:
+                    await self.lm.acquire(self, 'Y')
+                    log_event(self.name, 'leu', "leu Y", self.color); mark(F_LOGS)
+                    await asyncio.sleep(_uni(_lo, _hi)); mark(F_RANDOM)
+                    await self.lm.acquire(self, 'X')
+                    log_event(self.name, 'leu', "leu X", self.color); mark(F_LOGS)
+                else:
+                    await self.lm.acquire(self, 'X')
+                    log_event(self.name, 'leu', "leu X", self.color); mark(F_LOGS)
+                    await asyncio.sleep(_uni(_lo, _hi)); mark(F_RANDOM)
+                    await self.lm.acquire(self, 'Y')
+                    log_event(self.name, 'leu', "leu Y", self.color); mark(F_LOGS)
+
+                await asyncio.sleep(_uni(_lo, _hi)); mark(F_RANDOM)
+                log_event(self.name, 'escreveu', "escreveu X e Y", self.color); mark(F_LOGS)
+                self.lm.release(self, 'X')
+                self.lm.release(self, 'Y')
+                log_event(self.name, 'finalizou', "finalizou com sucesso", self.color); mark(F_LOGS)
+                self.committed = True
+
+            except AbortException:
+                log_event(self.name, 'abortada', "abortada, reiniciando", "purple"); mark(F_LOGS)
+                self.held.clear()
+                await asyncio.sleep(_uni(_lo, _hi)); mark(F_RANDOM)
 
 # -----------------------------------
 # UI com legendas fixas
@@ -238,6 +578,13 @@ class UI:
         self.last_graph     = 0
         self.graph_interval = 1.75
 
+        # tags de cor já configuradas no widget de log
+        self._known_tags = set()
+
+        # média de espera incremental (evita re-somar wait_times inteiro)
+        self._wait_sum = 0.0
+        self._wait_idx = 0
+
         # layout primário
         top = tk.Frame(root); top.pack(side=tk.TOP, fill=tk.X)
         mid = tk.Frame(root); mid.pack(fill=tk.BOTH, expand=True)
@@ -267,19 +614,19 @@ class UI:
         # 1) Flags
         left = tk.Frame(top); left.pack(side=tk.LEFT, padx=5)
         self.labels = {}
-        for text, key in [
-            ("1. Simulação de Transações", 'sim'),
-            ("2. Controle de Acesso",        'control'),
-            ("3. Identificação de Deadlock",  'deadlock'),
-            ("4. Múltiplas Threads",          'threads'),
-            ("5. Resolução de Deadlock",      'resolve'),
-            ("6. Delays Aleatórios",          'random'),
-            ("7. Logs Detalhados",            'logs'),
+        for text, bit in [
+            ("1. Simulação de Transações", F_SIM),
+            ("2. Controle de Acesso",        F_CONTROL),
+            ("3. Identificação de Deadlock",  F_DEADLOCK),
+            ("4. Múltiplas Threads",          F_THREADS),
+            ("5. Resolução de Deadlock",      F_RESOLVE),
+            ("6. Delays Aleatórios",          F_RANDOM),
+            ("7. Logs Detalhados",            F_LOGS),
         ]:
             var = tk.StringVar(value=f"✗ {text}")
             lbl = tk.Label(left, textvariable=var, anchor='w')
             lbl.pack(fill=tk.X)
-            self.labels[key] = var
+            self.labels[bit] = var
 
         # 2) Métricas
         right = tk.Frame(top); right.pack(side=tk.RIGHT, padx=5)
@@ -298,6 +645,20 @@ class UI:
         self.canvas_g = FigureCanvasTkAgg(self.fig_g, master=gframe)
         self.canvas_g.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # grafo construído uma única vez; só as arestas mudam por frame.
+        # Layout em conchas (recursos no centro, txns em volta) é
+        # determinístico e O(V), sem o custo iterativo do spring_layout.
+        res_ids   = list(self.lm.resources)
+        txn_names = [t.name for t in self.txns]
+        self.G = nx.DiGraph()
+        self.G.add_nodes_from(txn_names)
+        self.G.add_nodes_from(res_ids)
+        self._pos = nx.shell_layout(self.G, nlist=[res_ids, txn_names])
+        self._node_colors = [
+            'lightblue' if n in set(txn_names) else 'lightgreen'
+            for n in self.G.nodes()
+        ]
+
         # 4) Recursos
         rframe = tk.LabelFrame(mid, text="Recursos")
         rframe.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -327,15 +688,26 @@ class UI:
 
 
     def update_ui(self):
+        # dirigido a eventos: sem nada novo, só reagenda com backoff
+        if not ui_dirty.is_set():
+            self.root.after(250, self.update_ui)
+            return
+        ui_dirty.clear()
         now = time.time()
 
         # flags e métricas
-        for key, done in flags.items():
-            if done:
-                txt = self.labels[key].get()[2:]
-                self.labels[key].set(f"✔ {txt}")
-
-        avg_wait = sum(wait_times)/len(wait_times) if wait_times else 0.0
+        for bit, var in self.labels.items():
+            if FLAGS & bit:
+                txt = var.get()
+                if txt.startswith("✗"):
+                    var.set(f"✔{txt[1:]}")
+
+        # média incremental: soma apenas as esperas novas desde o último frame
+        new_waits = wait_times[self._wait_idx:]
+        if new_waits:
+            self._wait_sum += sum(new_waits)
+            self._wait_idx += len(new_waits)
+        avg_wait = self._wait_sum/self._wait_idx if self._wait_idx else 0.0
         self.metrics.config(text=(
             f"Métricas:\nDeadlocks: {deadlock_count}\n"
             f"Aborts: {abort_count}\nAvg wait: {avg_wait:.2f}s"
@@ -346,33 +718,32 @@ class UI:
             self.last_graph = now
 
             # — Wait-For Graph —
-            G = nx.DiGraph()
-            for t in self.txns:
-                G.add_node(t.name)
+            G   = self.G
+            pos = self._pos
+            G.clear_edges()
             for r in self.lm.resources.values():
-                G.add_node(r.item_id)
                 if r.locked_by:
                     G.add_edge(r.item_id, r.locked_by.name)
-                for w in r.queue:
+                # list(): cópia atômica; iterar o deque vivo enquanto as
+                # workers o mutam levantaria RuntimeError
+                for w in list(r.queue):
                     G.add_edge(w.name, r.item_id)
 
             self.ax_g.clear()
-            pos = nx.spring_layout(G)
             nx.draw(
                 G, pos, ax=self.ax_g,
-                node_color=[
-                    'lightblue' if n in [t.name for t in self.txns]
-                    else 'lightgreen'
-                    for n in G.nodes()
-                ],
+                node_color=self._node_colors,
                 with_labels=True, arrows=True
             )
-            for cycle in nx.simple_cycles(G):
-                edges = list(zip(cycle, cycle[1:]+[cycle[0]]))
-                nx.draw_networkx_edges(
-                    G, pos, edgelist=edges,
-                    edge_color='red', width=2, ax=self.ax_g
-                )
+            # uma passada de SCC (O(V+E)) em vez de enumerar todos os
+            # ciclos simples; só SCCs com mais de um nó são deadlock
+            for scc in nx.strongly_connected_components(G):
+                if len(scc) > 1:
+                    edges = [(u, v) for u, v in G.edges() if u in scc and v in scc]
+                    nx.draw_networkx_edges(
+                        G, pos, edgelist=edges,
+                        edge_color='red', width=2, ax=self.ax_g
+                    )
             self.canvas_g.draw()
 
             # — Recursos —
@@ -380,68 +751,105 @@ class UI:
                 res = self.lm.resources[rid]
                 fill = res.locked_by.color if res.locked_by else 'lightgray'
                 self.res_canvas.itemconfig(rid, fill=fill)
-                names = " ".join(t.name for t in res.queue)
+                names = " ".join(t.name for t in list(res.queue))
                 self.res_canvas.itemconfig(f"queue{rid}", text=names)
 
             # — Gantt Chart —
             self.ax_c.clear()
-            start_ts = event_queue[0][0] if event_queue else now
+            start_ts = sim_start_ts if sim_start_ts is not None else now
             state_colors = {
                 'entrou':'#1f77b4','esperando':'#ff7f0e',
                 'obteve':'#2ca02c','abortada':'#d62728','finalizou':'#9467bd'
             }
             for i,txn in enumerate(self.txns):
-                evs = [(ts,msg) for ts,name,msg in event_queue if name==txn.name]
-                for ts,msg in evs:
-                    # pega o segundo token e remove pontuação final
-                    raw = msg.split()[1]
-                    state = raw.rstrip(',:')
-                    self.ax_c.barh(
-                        i,
-                        0.1,
-                        left=ts - start_ts,
-                        color=state_colors.get(state, 'gray')
-    )
+                evs = events_by_txn.get(txn.name)
+                if not evs:
+                    continue
+                lefts, colors = [], []
+                # list(): iterar o deque vivo com as workers dando append
+                # levantaria RuntimeError; a cópia é atômica sob o GIL
+                for ts,kind in list(evs):
+                    lefts.append(ts - start_ts)
+                    colors.append(state_colors.get(kind, 'gray'))
+                # uma chamada barh vetorizada por transação
+                self.ax_c.barh(i, [0.1]*len(lefts), left=lefts, color=colors)
 
             self.ax_c.set_yticks(range(len(self.txns)))
             self.ax_c.set_yticklabels([t.name for t in self.txns])
             self.canvas_c.draw()
 
-        # log colorido
+        # log colorido: drena a fila inteira e insere em lotes por cor,
+        # um round-trip Tcl por lote em vez de um por entrada
+        entries = []
         try:
             while True:
-                tag, val = log_queue.get_nowait()
-                if tag == '_FLAG_': continue
-                entry, color = tag, val
-                if color:
-                    self.log.tag_configure(entry, foreground=color)
-                    self.log.insert(tk.END, entry+"\n", entry)
-                else:
-                    self.log.insert(tk.END, entry+"\n")
-                self.log.see(tk.END)
+                item = log_queue.get_nowait()
+                if item[0] == '_FLAG_': continue
+                ts, msg, color = item
+                ts_str = time.strftime("%H:%M:%S", time.localtime(ts))
+                entries.append((f"[{ts_str}] {msg}", color))
         except queue.Empty:
             pass
+        if entries:
+            i, n = 0, len(entries)
+            while i < n:
+                color = entries[i][1]
+                j = i
+                while j < n and entries[j][1] == color:
+                    j += 1
+                text = "\n".join(e[0] for e in entries[i:j]) + "\n"
+                if color:
+                    if color not in self._known_tags:
+                        self.log.tag_configure(color, foreground=color)
+                        self._known_tags.add(color)
+                    self.log.insert(tk.END, text, color)
+                else:
+                    self.log.insert(tk.END, text)
+                i = j
+            self.log.see(tk.END)
 
-        self.root.after(100, self.update_ui)
+        self.root.after(50, self.update_ui)
 
 # -----------------------------------
 # Execução principal
 # -----------------------------------
 if __name__ == "__main__":
-    lm   = LockManager(['X','Y'])
+    lm   = AsyncLockManager(['X','Y']) if args.asyncio else LockManager(['X','Y'])
     txns = [Transaction(i, i, lm) for i in range(1, args.n+1)]
 
+    async def _run_all():
+        await asyncio.gather(*(t.run_async() for t in txns))
+
     if args.gui:
         root = tk.Tk()
         ui   = UI(root, lm, txns)
-        for t in txns:
-            t.start()
+        if args.asyncio:
+            # event loop em uma thread auxiliar; o Tk continua dono da main
+            threading.Thread(target=asyncio.run, args=(_run_all(),),
+                             daemon=True).start()
+        elif args.pool:
+            pool = TxnPool(args.pool)
+            for t in txns:
+                pool.submit(t)
+        else:
+            for t in txns:
+                t.start()
         root.mainloop()
-        for t in txns:
-            t.join()
+        if not args.asyncio and not args.pool:
+            for t in txns:
+                t.join()
     else:
-        for t in txns:
-            t.start()
-        for t in txns:
-            t.join()
-        log_event("Todas as transações concluídas.", "blue")
+        if args.asyncio:
+            asyncio.run(_run_all())
+        elif args.pool:
+            pool = TxnPool(args.pool)
+            for t in txns:
+                pool.submit(t)
+            pool.join()
+        else:
+            for t in txns:
+                t.start()
+            for t in txns:
+                t.join()
+        log_event(None, 'fim', "Todas as transações concluídas.", "blue")
+        print_queue.join()  # garante que o printer esvazie antes de sair